@@ -13,10 +13,22 @@ from _pytest.fixtures import SubRequest
 from pytest import MonkeyPatch
 from torch.utils.data import ConcatDataset
 
-import torchgeo.datasets.utils
+import torchgeo.datasets.cowc
 from torchgeo.datasets import COWC, COWCCounting, COWCDetection, DatasetNotFoundError
 
 
+SHA256S = [
+    '84d7e021be4ef5bd0699ca7cacb515f1c95d4d5c0a2e594528e3fbf7c1a7beff',
+    '40b8a7153a2dd16f694a8717947916575dea80e647a6eabd91eb1735e39069b0',
+    '682a2d879f3332c2aa1969df32ed444a0759397f701f544fafe782a2510357e7',
+    '0f7d59b99d1ac55e6a00a3f03f825aadafe546021d9d143319fc1c439a8addb4',
+    '286aa6139fba6152485cb77ecfb7d34f8020dbb9ccc572e900a5765690ed2b86',
+    '1f521b6f3b6a842d31e2458b408c1c9b75b524e2292f96ebdbe6387e83b9fbbb',
+    '15ffdd329337d57b68a641b7ff16479012bd026d21e65b700aaa4b7f51139c41',
+    'd07af95d339167f2dd22a882d31db0658ce29116d490e3dce75fa7a903c10737',
+]
+
+
 def download_url(url: str, root: str, *args: str, **kwargs: str) -> None:
     shutil.copy(url, root)
 
@@ -32,7 +44,7 @@ class TestCOWCCounting:
     def dataset(
         self, monkeypatch: MonkeyPatch, tmp_path: Path, request: SubRequest
     ) -> COWC:
-        monkeypatch.setattr(torchgeo.datasets.utils, 'download_url', download_url)
+        monkeypatch.setattr(torchgeo.datasets.cowc, 'download_url', download_url)
         base_url = os.path.join('tests', 'data', 'cowc_counting') + os.sep
         monkeypatch.setattr(COWCCounting, 'base_url', base_url)
         md5s = [
@@ -68,6 +80,28 @@ class TestCOWCCounting:
     def test_already_downloaded(self, dataset: COWC) -> None:
         COWCCounting(root=dataset.root, download=True)
 
+    def test_in_memory(self, dataset: COWC) -> None:
+        ds = COWCCounting(root=dataset.root, split=dataset.split, in_memory=True)
+        assert ds.cache is not None
+        assert len(ds) == len(dataset)
+        assert torch.equal(ds[0]['image'], dataset[0]['image'])
+
+    def test_sha256(self, dataset: COWC, monkeypatch: MonkeyPatch) -> None:
+        monkeypatch.setattr(COWCCounting, 'sha256s', SHA256S)
+        COWCCounting(root=dataset.root, checksum=True)
+
+    def test_sha256_corrupted(self, dataset: COWC, monkeypatch: MonkeyPatch) -> None:
+        monkeypatch.setattr(COWCCounting, 'sha256s', ['0' * 64] * 8)
+        with pytest.raises(DatasetNotFoundError, match='Dataset not found'):
+            COWCCounting(root=dataset.root, checksum=True)
+
+    def test_sha256_empty(self, dataset: COWC, monkeypatch: MonkeyPatch) -> None:
+        monkeypatch.setattr(COWCCounting, 'sha256s', SHA256S)
+        filepath = os.path.join(dataset.root, COWCCounting.filenames[2])
+        open(filepath, 'wb').close()
+        with pytest.raises(DatasetNotFoundError, match='Dataset not found'):
+            COWCCounting(root=dataset.root, checksum=True)
+
     def test_out_of_bounds(self, dataset: COWC) -> None:
         with pytest.raises(IndexError):
             dataset[12]
@@ -96,7 +130,7 @@ class TestCOWCDetection:
     def dataset(
         self, monkeypatch: MonkeyPatch, tmp_path: Path, request: SubRequest
     ) -> COWC:
-        monkeypatch.setattr(torchgeo.datasets.utils, 'download_url', download_url)
+        monkeypatch.setattr(torchgeo.datasets.cowc, 'download_url', download_url)
         base_url = os.path.join('tests', 'data', 'cowc_detection') + os.sep
         monkeypatch.setattr(COWCDetection, 'base_url', base_url)
         md5s = [
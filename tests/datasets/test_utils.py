@@ -8,6 +8,7 @@ import pickle
 import re
 import shutil
 import sys
+import tarfile
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -88,6 +89,20 @@ def test_extract_archive(src: str, tmp_path: Path) -> None:
     extract_archive(os.path.join('tests', 'data', src), str(tmp_path))
 
 
+@pytest.mark.skipif(
+    not hasattr(tarfile, 'data_filter'), reason='requires tarfile extraction filters'
+)
+def test_extract_archive_outside_destination(tmp_path: Path) -> None:
+    src = tmp_path / 'evil.tar'
+    with tarfile.open(src, 'w') as tar:
+        tarinfo = tarfile.TarInfo('../evil.txt')
+        tar.addfile(tarinfo)
+    dst = tmp_path / 'dst'
+    with pytest.raises(tarfile.OutsideDestinationError):
+        extract_archive(str(src), str(dst))
+    assert not (tmp_path / 'evil.txt').exists()
+
+
 def test_unsupported_scheme() -> None:
     with pytest.raises(
         RuntimeError, match='src file has unknown archival/compression scheme'
@@ -35,7 +35,7 @@ class TestWesternUSALiveFuelMoisture:
     ) -> WesternUSALiveFuelMoisture:
         radiant_mlhub = pytest.importorskip('radiant_mlhub', minversion='0.3')
         monkeypatch.setattr(radiant_mlhub.Collection, 'fetch', fetch)
-        md5 = 'ecbc9269dd27c4efe7aa887960054351'
+        md5 = '20a24e16ef75b9ac5660d8d55d3bfd04'
         monkeypatch.setattr(WesternUSALiveFuelMoisture, 'md5', md5)
         root = str(tmp_path)
         transforms = nn.Identity()
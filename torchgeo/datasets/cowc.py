@@ -4,21 +4,22 @@
 """COWC datasets."""
 
 import abc
-import csv
+import hashlib
 import os
-from collections.abc import Callable
+import sys
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import cast
 
 import matplotlib.pyplot as plt
-import numpy as np
 import torch
 from matplotlib.figure import Figure
-from PIL import Image
 from torch import Tensor
+from torchvision.io import read_image
 
 from .errors import DatasetNotFoundError
 from .geo import NonGeoDataset
-from .utils import Path, check_integrity, download_and_extract_archive
+from .utils import Path, check_integrity, download_url, extract_archive
 
 
 class COWC(NonGeoDataset, abc.ABC):
@@ -58,6 +59,12 @@ class COWC(NonGeoDataset, abc.ABC):
     def md5s(self) -> list[str]:
         """List of MD5 checksums of files to download."""
 
+    #: Optional list of SHA-256 checksums of files to download. If set, these are
+    #: checked instead of :attr:`md5s`.
+    #:
+    #: .. versionadded:: 0.6
+    sha256s: list[str] | None = None
+
     @property
     @abc.abstractmethod
     def filename(self) -> str:
@@ -70,6 +77,7 @@ class COWC(NonGeoDataset, abc.ABC):
         transforms: Callable[[dict[str, Tensor]], dict[str, Tensor]] | None = None,
         download: bool = False,
         checksum: bool = False,
+        in_memory: bool = False,
     ) -> None:
         """Initialize a new COWC dataset instance.
 
@@ -79,11 +87,17 @@ class COWC(NonGeoDataset, abc.ABC):
             transforms: a function/transform that takes input sample and its target as
                 entry and returns a transformed version
             download: if True, download dataset and store it in the root directory
-            checksum: if True, check the MD5 of the downloaded files (may be slow)
+            checksum: if True, check the MD5 (or SHA-256, if available) of the
+                downloaded files (may be slow)
+            in_memory: if True, decode all images once and keep them in shared memory
+                (all images must be the same size)
 
         Raises:
             AssertionError: if ``split`` argument is invalid
             DatasetNotFoundError: If dataset is not found and *download* is False.
+
+        .. versionadded:: 0.6
+           The *in_memory* parameter.
         """
         assert split in ['train', 'test']
 
@@ -98,17 +112,21 @@ class COWC(NonGeoDataset, abc.ABC):
         if not self._check_integrity():
             raise DatasetNotFoundError(self)
 
-        self.images = []
-        self.targets = []
         with open(
-            os.path.join(self.root, self.filename.format(split)),
-            encoding='utf-8-sig',
-            newline='',
+            os.path.join(self.root, self.filename.format(split)), encoding='utf-8-sig'
         ) as f:
-            reader = csv.reader(f, delimiter=' ')
-            for row in reader:
-                self.images.append(row[0])
-                self.targets.append(row[1])
+            rows = [line.split(' ', 1) for line in f.read().splitlines()]
+
+        self.images = [os.path.join(self.root, row[0]) for row in rows]
+        self.targets = torch.tensor([int(row[1]) for row in rows], dtype=torch.long)
+
+        # Stored as a single uint8 tensor in shared memory so that DataLoader
+        # workers index into the same buffer instead of each holding a copy
+        self.cache: Tensor | None = None
+        if in_memory and self.images:
+            with ThreadPoolExecutor() as executor:
+                images = list(executor.map(read_image, self.images))
+            self.cache = torch.stack(images).share_memory_()
 
     def __getitem__(self, index: int) -> dict[str, Tensor]:
         """Return an index within the dataset.
@@ -143,13 +161,12 @@ class COWC(NonGeoDataset, abc.ABC):
         Returns:
             the image
         """
-        filename = os.path.join(self.root, self.images[index])
-        with Image.open(filename) as img:
-            array: np.typing.NDArray[np.int_] = np.array(img)
-            tensor = torch.from_numpy(array).float()
-            # Convert from HxWxC to CxHxW
-            tensor = tensor.permute((2, 0, 1))
-            return tensor
+        if self.cache is not None:
+            return self.cache[index].float()
+
+        # Decodes directly to a CxHxW tensor using libpng/libjpeg-turbo
+        tensor = read_image(self.images[index]).float()
+        return tensor
 
     def _load_target(self, index: int) -> Tensor:
         """Load a single target.
@@ -160,20 +177,51 @@ class COWC(NonGeoDataset, abc.ABC):
         Returns:
             the target
         """
-        target = int(self.targets[index])
-        tensor = torch.tensor(target).float()
+        tensor = self.targets[index].float()
         return tensor
 
     def _check_integrity(self) -> bool:
         """Check integrity of dataset.
 
         Returns:
-            True if dataset files are found and/or MD5s match, else False
+            True if dataset files are found and/or checksums match, else False
         """
-        for filename, md5 in zip(self.filenames, self.md5s):
-            filepath = os.path.join(self.root, filename)
-            if not check_integrity(filepath, md5 if self.checksum else None):
-                return False
+        filepaths = [os.path.join(self.root, filename) for filename in self.filenames]
+
+        if not self.checksum:
+            for filepath in filepaths:
+                if not check_integrity(filepath):
+                    return False
+            return True
+
+        # Don't bother hashing anything if a file is missing
+        if not all(os.path.isfile(filepath) for filepath in filepaths):
+            return False
+
+        def check(filepath: str, md5: str, sha256: str | None) -> bool:
+            algorithm, expected = ('md5', md5) if sha256 is None else ('sha256', sha256)
+            with open(filepath, 'rb') as f:
+                if sys.version_info >= (3, 11):
+                    digest = hashlib.file_digest(f, algorithm)
+                else:
+                    digest = hashlib.new(algorithm)
+                    while chunk := f.read(1 << 20):
+                        digest.update(chunk)
+            return digest.hexdigest() == expected
+
+        sha256s: Sequence[str | None] = self.sha256s or [None] * len(filepaths)
+
+        # hashlib releases the GIL, so files can be hashed in parallel. Exiting the
+        # executor always waits for running checks, so no file is still open when
+        # _download goes on to overwrite it.
+        with ThreadPoolExecutor(max_workers=len(filepaths)) as executor:
+            futures = [
+                executor.submit(check, filepath, md5, sha256)
+                for filepath, md5, sha256 in zip(filepaths, self.md5s, sha256s)
+            ]
+            for future in as_completed(futures):
+                if not future.result():
+                    return False
         return True
 
     def _download(self) -> None:
@@ -183,13 +231,18 @@ class COWC(NonGeoDataset, abc.ABC):
             return
 
         for filename, md5 in zip(self.filenames, self.md5s):
-            download_and_extract_archive(
+            download_url(
                 self.base_url + filename,
                 self.root,
                 filename=filename,
                 md5=md5 if self.checksum else None,
             )
 
+        # Archives are independent, so overlap their decompression and file I/O
+        filepaths = [os.path.join(self.root, filename) for filename in self.filenames]
+        with ThreadPoolExecutor(max_workers=len(filepaths)) as executor:
+            list(executor.map(extract_archive, filepaths))
+
     def plot(
         self,
         sample: dict[str, Tensor],
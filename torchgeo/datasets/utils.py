@@ -9,6 +9,7 @@ from __future__ import annotations
 import bz2
 import collections
 import contextlib
+import functools
 import gzip
 import importlib
 import lzma
@@ -91,7 +92,8 @@ def extract_archive(src: str, dst: str | None = None) -> None:
         ('.rar', _rarfile.RarFile),
         (
             ('.tar', '.tar.gz', '.tar.bz2', '.tar.xz', '.tgz', '.tbz2', '.tbz', '.txz'),
-            tarfile.open,
+            # Default 16 KiB copy buffer is a bottleneck for large members
+            functools.partial(tarfile.open, copybufsize=1 << 20),
         ),
         ('.zip', _zipfile.ZipFile),
     ]
@@ -99,7 +101,11 @@ def extract_archive(src: str, dst: str | None = None) -> None:
     for suffix, extractor in suffix_and_extractor:
         if src.endswith(suffix):
             with extractor(src, 'r') as f:
-                f.extractall(dst)
+                # Python 3.12+ (and security backports to older versions)
+                if isinstance(f, tarfile.TarFile) and hasattr(tarfile, 'data_filter'):
+                    f.extractall(dst, filter='data')
+                else:
+                    f.extractall(dst)
             return
 
     suffix_and_decompressor: list[tuple[str, Any]] = [
@@ -112,7 +118,7 @@ def extract_archive(src: str, dst: str | None = None) -> None:
         if src.endswith(suffix):
             dst = os.path.join(dst, os.path.basename(src).replace(suffix, ''))
             with decompressor(src, 'rb') as sf, open(dst, 'wb') as df:
-                df.write(sf.read())
+                shutil.copyfileobj(sf, df, length=1 << 20)
             return
 
     raise RuntimeError('src file has unknown archival/compression scheme')